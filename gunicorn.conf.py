@@ -1,3 +1,7 @@
 workers = 4
+# Threaded workers so requests blocked on URL fetches don't hold a whole worker;
+# threads share the pooled requests.Session in server.py
+worker_class = "gthread"
+threads = 8
 bind = "0.0.0.0:10000"
 timeout = 120
\ No newline at end of file
@@ -4,7 +4,7 @@
 # import os
 # import json
 # import requests
-# from utils.html_parser import HTMLParser
+# from utils.html_parser import HTMLParser, node_to_dict
 
 # app = Flask(__name__)
 # CORS(app)  # Enable CORS for all routes
@@ -33,16 +33,6 @@
 #         parsed = parser.parse(html)
         
 #         # Convert to dictionary for JSON response
-#         def node_to_dict(node) -> dict:
-#             return {
-#                 "tag": node.tag,
-#                 "classes": node.classes,
-#                 "text": node.text,
-#                 "attributes": node.attributes,
-#                 "figma_styles": node.figma_styles,
-#                 "children": [node_to_dict(child) for child in node.children]
-#             }
-        
 #         design_data = node_to_dict(parsed)
         
 #         # For debug purposes - write to file
@@ -60,62 +50,161 @@
 
 
 # production mode
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify
+from flask.json.provider import JSONProvider
 from flask_cors import CORS
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import hashlib
+import io
 import os
-import json
+import threading
+import orjson
 import requests
-from utils.html_parser import HTMLParser
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from utils.html_parser import HTMLParser, iter_json
+
+class ORJSONProvider(JSONProvider):
+    # Route jsonify and request.get_json through orjson
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
 
 app = Flask(__name__)
+app.json = ORJSONProvider(app)
 CORS(app)
 
 # Get port from environment variable for production
 port = int(os.environ.get("PORT", 5000))
 
+# Shared session so repeated fetches reuse pooled keep-alive connections
+SESSION = requests.Session()
+adapter = HTTPAdapter(pool_connections=32, pool_maxsize=64, max_retries=Retry(total=2, backoff_factor=0.2))
+SESSION.mount('https://', adapter)
+SESSION.mount('http://', adapter)
+SESSION.headers.update({
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+})
+
+# Pages are read in chunks and rejected past this size rather than buffered whole
+MAX_HTML_BYTES = 10 * 1024 * 1024
+
+class PageTooLargeError(ValueError):
+    # Raised by fetch_html when the upstream page exceeds MAX_HTML_BYTES
+    pass
+
+def fetch_html(url: str):
+    # Returns (html, status_code); html is None when the fetch did not return 200
+    response = SESSION.get(url, timeout=(3.05, 30), stream=True)
+    try:
+        if response.status_code != 200:
+            return None, response.status_code
+        body = io.BytesIO()
+        for chunk in response.iter_content(chunk_size=64 * 1024):
+            body.write(chunk)
+            if body.tell() > MAX_HTML_BYTES:
+                raise PageTooLargeError(f'Page at {url} exceeds {MAX_HTML_BYTES} bytes')
+        return body.getvalue().decode(response.encoding or 'utf-8', errors='replace'), response.status_code
+    finally:
+        # Always releases the connection: a fully read body returns it to the pool, while an
+        # early non-200 return or a tripped size cap closes the socket instead of draining it
+        response.close()
+
+# Debug dumps are written off the request thread; off unless DUMP_DESIGN_SPECS=1
+DUMP_DESIGN_SPECS = os.environ.get('DUMP_DESIGN_SPECS', '0') == '1'
+DUMP_DIR = 'output_files'
+dump_executor = ThreadPoolExecutor(max_workers=1)
+if DUMP_DESIGN_SPECS:
+    # Created once here instead of on every dump
+    os.makedirs(DUMP_DIR, exist_ok=True)
+
+def write_design_specs(body: bytes, path: str = os.path.join(DUMP_DIR, 'design_specs.json')):
+    # Write to a temp file and rename so readers never see a partial dump
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(body)
+    os.replace(tmp_path, path)
+
+# HTMLParser keeps no per-parse state, so one instance serves every request and thread
+PARSER = HTMLParser()
+
+# Serialised specs keyed by a hash of the HTML, so repeated documents skip parsing entirely.
+# Bounded by entry count and by total body bytes; bodies over SPEC_CACHE_MAX_ENTRY_BYTES
+# are served but never cached, so large documents can't pin memory in a worker
+SPEC_CACHE_SIZE = 128
+SPEC_CACHE_MAX_BYTES = 64 * 1024 * 1024
+SPEC_CACHE_MAX_ENTRY_BYTES = 4 * 1024 * 1024
+spec_cache = OrderedDict()
+spec_cache_bytes = 0
+spec_cache_lock = threading.Lock()
+
+def get_cached_specs(html: str):
+    # Returns (json_bytes, etag); least recently used entries are evicted first.
+    # Keyed by the HTML, but the ETag hashes the body, so a deploy or restart that
+    # changes the output (e.g. imageHash) never revalidates a stale client copy
+    global spec_cache_bytes
+    key = hashlib.blake2b(html.encode(), digest_size=16).digest()
+    with spec_cache_lock:
+        entry = spec_cache.get(key)
+        if entry is not None:
+            spec_cache.move_to_end(key)
+            return entry
+
+    body = b''.join(iter_json(PARSER.parse(html)))
+    entry = body, hashlib.blake2b(body, digest_size=16).hexdigest()
+    if len(body) > SPEC_CACHE_MAX_ENTRY_BYTES:
+        return entry
+
+    with spec_cache_lock:
+        # Another thread may have cached the same document meanwhile
+        previous = spec_cache.pop(key, None)
+        if previous is not None:
+            spec_cache_bytes -= len(previous[0])
+        spec_cache[key] = entry
+        spec_cache_bytes += len(body)
+        while len(spec_cache) > SPEC_CACHE_SIZE or spec_cache_bytes > SPEC_CACHE_MAX_BYTES:
+            _, (evicted, _) = spec_cache.popitem(last=False)
+            spec_cache_bytes -= len(evicted)
+    return entry
+
 @app.route('/getDesignSpecs', methods=['POST'])
 def get_design_specs():
     try:
         data = request.get_json()
         
         if 'url' in data:
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-            }
-            response = requests.get(data['url'], headers=headers)
-            if response.status_code != 200:
-                return jsonify({'error': f'Failed to fetch URL. Status code: {response.status_code}'}), response.status_code
-            html = response.text
+            html, status_code = fetch_html(data['url'])
+            if status_code != 200:
+                return jsonify({'error': f'Failed to fetch URL. Status code: {status_code}'}), status_code
         elif 'html' in data:
             html = data['html']
         else:
             return jsonify({'error': 'Either URL or HTML content must be provided'}), 400
             
-        parser = HTMLParser()
-        parsed = parser.parse(html)
-        
-        def node_to_dict(node) -> dict:
-            return {
-                "tag": node.tag,
-                "classes": node.classes,
-                "text": node.text,
-                "attributes": node.attributes,
-                "figma_styles": node.figma_styles,
-                "children": [node_to_dict(child) for child in node.children]
-            }
+        body, etag = get_cached_specs(html)
         
-        design_data = node_to_dict(parsed)
-        
-        # Only write files in debug mode
-        if app.debug:
-            os.makedirs('output_files', exist_ok=True)
-            with open('output_files/design_specs.json', 'w') as f:
-                json.dump(design_data, f, indent=2)
+        # Only write files when dumps are enabled, in debug mode or when a request asks with ?dump=1
+        if DUMP_DESIGN_SPECS and (app.debug or request.args.get('dump') == '1'):
+            dump_executor.submit(write_design_specs, body)
             
-        return jsonify(design_data)
+        # Clients revalidating with If-None-Match get a 304 (make_conditional only covers GET/HEAD)
+        if request.if_none_match.contains(etag):
+            response = Response(status=304)
+        else:
+            # Already-encoded bytes, so Werkzeug can hand them to the server as-is
+            response = Response(body, mimetype='application/json', direct_passthrough=True)
+        response.set_etag(etag)
+        return response
         
+    except PageTooLargeError as e:
+        # The upstream page is at fault, not this server
+        return jsonify({'error': str(e)}), 502
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 if __name__ == '__main__':
-    app.run(host='0.0.0.0', port=port)
\ No newline at end of file
+    # Reloader and debugger stay off unless FLASK_DEBUG=1
+    app.run(host='0.0.0.0', port=port, debug=os.environ.get('FLASK_DEBUG') == '1')
\ No newline at end of file
@@ -1,4 +1,7 @@
-from typing import List, Dict
+from typing import List, Dict, Tuple
+from types import MappingProxyType
+from functools import lru_cache
+from .frozen_styles import freeze
 
 # Style Resolution Matrix for Bootstrap to Figma
 BOOTSTRAP_TO_FIGMA = {
@@ -44,15 +47,31 @@ BOOTSTRAP_TO_FIGMA = {
     "start-0": {"x": 0},
 }
 
+# Percentage sizing utilities (w-25 = 25%, ..., h-100 = 100%)
+BOOTSTRAP_DIMENSIONS = {
+    **{f"w-{n}": {"width": f"{n}%"} for n in (25, 50, 75, 100)},
+    **{f"h-{n}": {"height": f"{n}%"} for n in (25, 50, 75, 100)},
+}
+BOOTSTRAP_TO_FIGMA.update({cls: {**BOOTSTRAP_TO_FIGMA.get(cls, {}), **styles} for cls, styles in BOOTSTRAP_DIMENSIONS.items()})
+
+# Nested values frozen once here, since every resolved result shares them with the matrix
+BOOTSTRAP_TO_FIGMA = {cls: {prop: freeze(value) for prop, value in styles.items()} for cls, styles in BOOTSTRAP_TO_FIGMA.items()}
+
+# Repeated class lists are resolved once; the cached mapping is read-only
+@lru_cache(maxsize=4096)
+def _resolve_bootstrap_classes(classes: Tuple[str, ...]) -> MappingProxyType:
+    styles = {}
+    for class_styles in map(BOOTSTRAP_TO_FIGMA.get, classes):
+        if class_styles:
+            styles.update(class_styles)
+    return MappingProxyType(styles)
+
 # Function to resolve Bootstrap classes to Figma styles
 def resolve_bootstrap_styles(classes: List[str]) -> Dict[str, any]:
-    styles = {}
-    for cls in classes:
-        if cls in BOOTSTRAP_TO_FIGMA:
-            styles.update(BOOTSTRAP_TO_FIGMA[cls])
-    return styles
+    # Shallow copy; list-valued props (fills, effects) come back as fresh lists of frozen items
+    return {prop: list(value) if type(value) is tuple else value for prop, value in _resolve_bootstrap_classes(tuple(classes)).items()}
 
-# Example usage
+# Example usage (python -m utils.bootstrap_to_figma_resolver)
 if __name__ == "__main__":
     # Example Bootstrap classes from a parsed node
     example_classes = ["d-flex", "align-items-center", "justify-content-center", "p-3", "bg-primary", "rounded"]
@@ -0,0 +1,35 @@
+from typing import Any
+
+
+class FrozenDict(dict):
+    """Read-only dict for style values shared between the class tables and every resolved result.
+
+    Still a dict, so json/orjson serialise it natively; copies of it are safe to share as-is.
+    """
+    __slots__ = ()
+
+    def _read_only(self, *args, **kwargs):
+        raise TypeError("shared style values are read-only; copy them with dict() first")
+
+    __setitem__ = __delitem__ = _read_only
+    update = setdefault = pop = popitem = clear = _read_only
+    __ior__ = _read_only
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __reduce__(self):
+        return FrozenDict, (dict(self),)
+
+
+def freeze(value: Any) -> Any:
+    # Nested lists/dicts become tuples/FrozenDicts, so a caller editing a resolved
+    # "fills" or "constraints" value can't write back into a shared table
+    if isinstance(value, dict):
+        return FrozenDict({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+    return value
@@ -1,122 +1,264 @@
-from bs4 import BeautifulSoup, Tag, NavigableString
-from dataclasses import dataclass, field
-from typing import List, Dict, Optional
-from .bootstrap_to_figma_resolver import resolve_bootstrap_styles
-from .tailwind_to_figma_resolver import resolve_tailwind_styles
+from bs4 import BeautifulSoup, SoupStrainer, Tag, NavigableString
+from bs4.builder import builder_registry
+from typing import List, Dict, Optional, Tuple
+from functools import lru_cache
+from types import MappingProxyType
+from .bootstrap_to_figma_resolver import BOOTSTRAP_TO_FIGMA
+from .tailwind_to_figma_resolver import TAILWIND_TO_FIGMA, TAILWIND_DIMENSIONS
+from .frozen_styles import freeze
 import re
-import cssutils
-import requests
-import os
-import json
-from flask import Flask, request, jsonify # Enable CORS for all routes
+import sys
+import threading
+import orjson
+
+# Prefer the C-backed lxml tree builder, falling back to the pure-Python parser
+SOUP_PARSER = 'lxml' if builder_registry.lookup('lxml') else 'html.parser'
+
+# Tree builders hold per-parse state, so each thread reuses its own instead of
+# BeautifulSoup looking one up and constructing it on every parse
+_thread_local = threading.local()
+
+def _soup_builder():
+    builder = getattr(_thread_local, 'builder', None)
+    if builder is None:
+        builder = _thread_local.builder = builder_registry.lookup(SOUP_PARSER)()
+    return builder
+
+# Only <body> is converted, so <head> (scripts, styles, meta) is never built into the tree
+BODY_ONLY = SoupStrainer('body')
+
+# Framework-independent class tables
+TEXT_COLOR_CLASSES = {
+    'text-textPrimary': {'r': 0.1, 'g': 0.1, 'b': 0.1},
+    'text-textSecondary': {'r': 0.4, 'g': 0.4, 'b': 0.4},
+    'text-primary': {'r': 0, 'g': 0.47, 'b': 1},  # Example primary color
+    'text-warning': {'r': 1, 'g': 0.8, 'b': 0}    # Example warning color
+}
+
+FONT_WEIGHT_CLASSES = {
+    'font-light': 300,
+    'font-normal': 400,
+    'font-medium': 500,
+    'font-semibold': 600,
+    'font-bold': 700
+}
+
+FONT_SIZE_CLASSES = {
+    'text-xs': 12, 'text-sm': 14, 'text-base': 16, 'text-lg': 18,
+    'text-xl': 20, 'text-2xl': 24, 'text-3xl': 30, 'text-4xl': 36,
+    'text-5xl': 48, 'text-6xl': 60
+}
+
+TEXT_ALIGN_CLASSES = {
+    'text-left': 'LEFT',
+    'text-center': 'CENTER',
+    'text-right': 'RIGHT',
+    'text-justify': 'JUSTIFY'
+}
+
+# CSS font property -> (Figma property, converter) for inline styles
+FONT_STYLE_CONVERTERS = {
+    'font-size': ('fontSize', lambda v: int(float(v.replace('px', '')))),
+    'font-weight': ('fontWeight', lambda v: int(v)),
+    'text-align': ('textAlign', lambda v: v.upper()),
+    'line-height': ('lineHeight', lambda v: {'unit': 'PIXELS', 'value': int(float(v.replace('px', '')))})
+}
+
+# Byte / doubled short-form digit -> 0..1 channel value
+_BYTE_UNIT = tuple(i / 255 for i in range(256))
+_HEX_NIBBLE = {f'{i:x}': i * 17 / 255 for i in range(16)}
+
+# Framework markers matched in one pass over the raw HTML before parsing: a Bootstrap
+# stylesheet, the Tailwind script, or a class attribute whose tokens are checked for a
+# palette class such as bg-blue-500 that only Tailwind generates. Only tag and attribute
+# names are case-insensitive. Every scan stops at the next '<' or '>', so each tag is
+# visited a bounded number of times and the search stays linear on malformed markup
+_BOOTSTRAP_LINK = r'<(?i:link)\b[^<>]*?\s(?i:href)\s*=\s*["\']?[^"\'\s<>]*bootstrap'
+_TAILWIND_SCRIPT = r'<(?i:script)\b[^<>]*?\s(?i:src)\s*=\s*["\']?[^"\'\s<>]*tailwind'
+_CLASS_ATTR = r'<[a-zA-Z][^<>]*?\s(?i:class)\s*=\s*(?:"(?P<dq>[^"<>]*)"|\'(?P<sq>[^\'<>]*)\'|(?P<bare>[^\s"\'<>]+))'
+_FRAMEWORK_MARKER_RE = re.compile(f'(?P<bootstrap>{_BOOTSTRAP_LINK})|(?P<tailwind>{_TAILWIND_SCRIPT})|{_CLASS_ATTR}')
+_BOOTSTRAP_LINK_RE = re.compile(_BOOTSTRAP_LINK)
+
+# Palette classes such as bg-blue-500; the prefix check keeps the regex off most tokens
+_TAILWIND_CLASS_RE = re.compile(r'(?:bg|text|border)-[a-z]+-\d{3}')
+_TAILWIND_PALETTE_PREFIXES = ('bg-', 'text-', 'border-')
+
+# Non-visual elements that never become Figma layers; their subtrees are not walked
+_SKIP_TAGS = frozenset({'script', 'style', 'meta', 'link', 'noscript', 'template'})
+
+# One inline-style declaration: splits on top-level ';' only, keeping url(...) and quoted values intact
+_DECLARATION_RE = re.compile(r'(?:[^;("\']|\([^)]*\)|"[^"]*"|\'[^\']*\')+')
+
+# Keyword sizes for images (Tailwind and Bootstrap); numeric sizes come from the class tables
+IMAGE_DIMENSION_CLASSES = {
+    # Tailwind
+    'w-full': ('width', '100%'),
+    'w-screen': ('width', '100vw'),
+    'h-full': ('height', '100%'),
+    'h-screen': ('height', '100vh'),
+    # Bootstrap
+    'w-100': ('width', '100%'),
+    'h-100': ('height', '100%'),
+}
+
+def _build_class_styles(framework_styles: Dict[str, dict]) -> Dict[str, dict]:
+    """Fuse a framework matrix with the shared class tables into one class -> styles lookup"""
+    table = {}
+    for cls, color in TEXT_COLOR_CLASSES.items():
+        table[cls] = {'fills': [{'type': 'SOLID', 'color': color}]}
+    for cls, styles in framework_styles.items():
+        table.setdefault(cls, {}).update(styles)
+    for cls, weight in FONT_WEIGHT_CLASSES.items():
+        table.setdefault(cls, {})['fontWeight'] = weight
+    for cls, size in FONT_SIZE_CLASSES.items():
+        table.setdefault(cls, {})['fontSize'] = size
+    for cls, align in TEXT_ALIGN_CLASSES.items():
+        table.setdefault(cls, {})['textAlign'] = align
+    # Interned to match the interned class names coming out of _parse_node; values are
+    # frozen because resolved mappings are shared between nodes and across requests
+    return {sys.intern(cls): {prop: freeze(value) for prop, value in styles.items()} for cls, styles in table.items()}
+
+# Without a detected framework, sizing classes fall back to the Tailwind scale
+CLASS_STYLES = {
+    None: _build_class_styles(TAILWIND_DIMENSIONS),
+    'bootstrap': _build_class_styles(BOOTSTRAP_TO_FIGMA),
+    'tailwind': _build_class_styles(TAILWIND_TO_FIGMA),
+}
+
+@lru_cache(maxsize=4096)
+def _styles_for_classes(framework: Optional[str], classes: Tuple[str, ...]) -> MappingProxyType:
+    """Resolve a class list in a single pass over the fused lookup table"""
+    table = CLASS_STYLES[framework]
+    styles = {}
+    for cls in classes:
+        # One hash probe per class via dict.get
+        class_styles = table.get(cls)
+        if class_styles:
+            styles.update(class_styles)
+        elif framework != 'bootstrap' and cls.startswith(('w-', 'h-')) and cls[2:].isdecimal():
+            # Tailwind-scale sizes past the table (w-120, h-200): 1 unit = 4px
+            styles['width' if cls[0] == 'w' else 'height'] = int(cls[2:]) * 4
+    # Read-only view so every node with this class list can share one mapping
+    return MappingProxyType(styles)
+
+
+# Shared default for nodes whose class list resolves nothing; _mutable_styles copies before writing
+_NO_STYLES = MappingProxyType({})
 
-
-@dataclass
 class HTMLNode:
-    tag: str
-    classes: List[str] = field(default_factory=list)
-    children: List['HTMLNode'] = field(default_factory=list)
-    text: Optional[str] = None
-    attributes: Dict[str, str] = field(default_factory=dict)
-    framework: Optional[str] = None
-    styles: Dict[str, str] = field(default_factory=dict)
-    figma_styles: Dict[str, any] = field(default_factory=dict)  
+    # Slotted rather than a dataclass: no per-node __dict__ (dataclass slots=True needs Python 3.10)
+    __slots__ = ('tag', 'classes', 'children', 'text', 'attributes', 'framework', 'styles', 'figma_styles')
+
+    def __init__(
+        self,
+        tag: str,
+        classes: Optional[List[str]] = None,
+        children: Optional[List['HTMLNode']] = None,
+        text: Optional[str] = None,
+        attributes: Optional[Dict[str, str]] = None,
+        framework: Optional[str] = None,
+        styles: Optional[Dict[str, str]] = None,
+        figma_styles: Optional[Dict[str, any]] = None
+    ):
+        self.tag = tag
+        self.classes = classes if classes is not None else []
+        self.children = children if children is not None else []
+        self.text = text
+        self.attributes = attributes if attributes is not None else {}
+        self.framework = framework
+        self.styles = styles if styles is not None else {}
+        self.figma_styles = figma_styles if figma_styles is not None else _NO_STYLES
+
+    def __repr__(self) -> str:
+        return f"HTMLNode(tag={self.tag!r}, classes={self.classes!r}, children={len(self.children)})"
 
 class HTMLParser:
-    def __init__(self):
-        self.framework = None
-        self.color_regex = re.compile(
-            r'^#([a-fA-F0-9]{3,4}|[a-fA-F0-9]{6}|[a-fA-F0-9]{8})$|^rgb(a?)\((\d+),\s*(\d+),\s*(\d+)(?:,\s*([\d.]+))?\)$'
-        )
-        self.font_size_regex = re.compile(r'^text-(xs|sm|base|lg|xl|2xl|3xl|4xl|5xl|6xl)$')
-        self.dimension_regex = re.compile(r'^([wh])-(\d+)$')
+    # Stateless: the detected framework is threaded through each parse and exposed on the returned nodes
 
     def parse(self, html: str) -> HTMLNode:
-        soup = BeautifulSoup(html, 'html.parser')
-        self._detect_framework(soup)
-        return self._parse_node(soup.body) if soup.body else HTMLNode(tag='body')
-
-    def _detect_framework(self, soup: BeautifulSoup):
-        # Check for Bootstrap
-        bootstrap_links = soup.find_all('link', href=lambda x: x and 'bootstrap' in x)
-        if bootstrap_links:
-            self.framework = 'bootstrap'
-            return
-
-        # Check for Tailwind
-        tailwind_scripts = soup.find_all('script', src=lambda x: x and 'tailwind' in x)
-        tailwind_classes = soup.find_all(class_=lambda x: x and re.match(r'^(bg|text|border)-[a-z]+-\d{3}$', x))
-        if tailwind_scripts or tailwind_classes:
-            self.framework = 'tailwind'
-            return
+        # Detect on the raw markup so the soup only has to hold <body>
+        framework = self._detect_framework(html)
+        soup = BeautifulSoup(html, builder=_soup_builder(), parse_only=BODY_ONLY)
+        return self._parse_node(soup.body, framework) if soup.body else HTMLNode(tag='body', framework=framework)
+
+    def _detect_framework(self, html: str) -> Optional[str]:
+        for match in _FRAMEWORK_MARKER_RE.finditer(html):
+            if match.group('bootstrap'):
+                return 'bootstrap'
+            if not match.group('tailwind'):
+                value = match.group('dq') or match.group('sq') or match.group('bare') or ''
+                if not any(
+                    cls.startswith(_TAILWIND_PALETTE_PREFIXES) and _TAILWIND_CLASS_RE.fullmatch(cls)
+                    for cls in value.split()
+                ):
+                    continue
+            # A Bootstrap stylesheet outranks any Tailwind hint, so only the rest still needs a look
+            return 'bootstrap' if _BOOTSTRAP_LINK_RE.search(html, match.end()) else 'tailwind'
+        return None
 
     def _process_image_dimensions(self, html_node: HTMLNode):
         """
-        Process dimension-related classes for both Tailwind and Bootstrap.
-        Handles classes like:
-        - Tailwind: w-24, h-40, w-full, h-screen
-        - Bootstrap: w-25, h-50, w-100, h-100
+        Process keyword dimension classes for images in both Tailwind and Bootstrap.
+        Handles classes like w-full, h-screen, w-100 and h-100; numeric classes
+        (w-24, h-40, w-25, h-50) are already resolved from the class tables.
         """
         if html_node.tag != 'img':
             return  # Only process dimensions for image nodes
-
-        # Mapping for special dimension classes (Tailwind and Bootstrap)
-        dimension_classes = {
-            # Tailwind
-            'w-full': '100%',
-            'w-screen': '100vw',
-            'h-full': '100%',
-            'h-screen': '100vh',
-            # Bootstrap
-            'w-100': '100%',
-            'h-100': '100%',
-        }
-
-        # Process numeric width/height classes
-        for cls in html_node.classes:
-            if cls.startswith(('w-', 'h-')):
-                try:
-                    # Extract the numeric value from the class
-                    value = int(cls.split('-')[1])
-                    # Determine the framework and convert to pixels
-                    if self.framework == 'tailwind':
-                        # Tailwind: 1 unit = 4px
-                        pixels = value * 4
-                    elif self.framework == 'bootstrap':
-                        # Bootstrap: w-25 = 25%, w-50 = 50%, etc.
-                        pixels = f"{value}%"
-                    else:
-                        # Default to Tailwind behavior if framework is not detected
-                        pixels = value * 4
-
-                    # Set the dimension in figma_styles
-                    if cls.startswith('w-'):
-                        html_node.figma_styles['width'] = pixels
-                    elif cls.startswith('h-'):
-                        html_node.figma_styles['height'] = pixels
-                except (IndexError, ValueError):
-                    # Skip invalid or non-numeric classes (e.g., w-auto)
-                    continue
-
-        # Handle special classes (e.g., w-full, w-100)
-        for cls in html_node.classes:
-            if cls in dimension_classes:
-                if cls.startswith('w-'):
-                    html_node.figma_styles['width'] = dimension_classes[cls]
-                elif cls.startswith('h-'):
-                    html_node.figma_styles['height'] = dimension_classes[cls]
-
-    def _parse_node(self, node: Tag) -> HTMLNode:
-        html_node = HTMLNode(
-            tag=node.name,
-            classes=node.get('class', []),
-            attributes=self._get_attributes(node),
-            framework=self.framework
-        )
-
-        # Handle text content
-        if node.string and node.string.strip():
-            html_node.text = node.string.strip()
+        figma_styles = self._mutable_styles(html_node)
+
+        for dimension in map(IMAGE_DIMENSION_CLASSES.get, html_node.classes):
+            if dimension:
+                prop, value = dimension
+                figma_styles[prop] = value
+
+    def _parse_node(self, node: Tag, framework: Optional[str]) -> HTMLNode:
+        # Walk the tree with an explicit stack so deep pages don't hit the recursion limit
+        root = None
+        stack = [(node, None)]
+        # Bound once: these run for every element on the page
+        pop, push = stack.pop, stack.append
+        get_attributes, populate_node = self._get_attributes, self._populate_node
+        # Tag and class names repeat across the page, so each node shares one interned copy
+        intern = sys.intern
+        while stack:
+            tag, parent = pop()
+            html_node = HTMLNode(
+                tag=intern(tag.name),
+                classes=[intern(cls) for cls in tag.get('class', ())],
+                attributes=get_attributes(tag),
+                framework=framework
+            )
+            populate_node(html_node, tag)
+
+            if parent is None:
+                root = html_node
+            else:
+                parent.children.append(html_node)
+
+            # Single pass over the children: tags are queued, direct text fragments are joined
+            child_tags = []
+            fragments = []
+            for child in tag.contents:
+                if isinstance(child, Tag):
+                    if child.name not in _SKIP_TAGS:
+                        child_tags.append(child)
+                # Exact type: Comment, CData, Doctype etc. subclass NavigableString but aren't visible text
+                elif type(child) is NavigableString:
+                    text = child.strip()
+                    if text:
+                        fragments.append(text)
+            if fragments:
+                html_node.text = ' '.join(fragments)
+
+            # Pushed in reverse so they are visited in document order
+            for child in reversed(child_tags):
+                push((child, html_node))
+
+        return root
+
+    def _populate_node(self, html_node: HTMLNode, node: Tag):
+        # Resolve class styles first so node-specific styles below take precedence
+        html_node.figma_styles = self._resolve_class_styles(html_node.classes, html_node.framework)
 
         # Handle images
         if node.name == 'img':
@@ -129,217 +271,184 @@ class HTMLParser:
             self._apply_font_styles(html_node, parsed_styles)
             self._apply_color_styles(html_node, parsed_styles)
 
-        self._process_text_color_classes(html_node)
-        self._process_image_dimensions(html_node)
-
-        # Resolve framework-specific styles
-        if self.framework == 'bootstrap':
-            html_node.figma_styles = resolve_bootstrap_styles(html_node.classes)
-        elif self.framework == 'tailwind':
-            html_node.figma_styles = resolve_tailwind_styles(html_node.classes)
-
-        # Additional font style handling
-        self._process_font_classes(html_node)
-        self._process_dimension_classes(html_node)
-
-        # Process child nodes
-        for child in node.children:
-            if isinstance(child, Tag):
-                html_node.children.append(self._parse_node(child))
-            elif isinstance(child, NavigableString) and child.strip():
-                html_node.text = child.strip()
-
-        return html_node
-
-    def _process_image_node(self, html_node: HTMLNode, node: Tag):
-        # Handle image source
-        if 'src' in node.attrs:
-            html_node.attributes['src'] = node['src']
-        
-        # Handle image dimensions
-        html_node.figma_styles.update({
-            'constraints': {'horizontal': 'SCALE', 'vertical': 'SCALE'},
-            'layoutMode': 'NONE'
-        })
+    def _resolve_class_styles(self, classes: List[str], framework: Optional[str]) -> MappingProxyType:
+        # Repeated class combinations share one cached read-only mapping
+        return _styles_for_classes(framework, tuple(classes))
 
-    def _process_font_classes(self, html_node: HTMLNode):
-        # Handle font-related classes
-        font_styles = {}
-        for cls in html_node.classes:
-            # Font weight
-            if cls.startswith('font-'):
-                weight = cls.split('-')[-1]
-                font_styles['fontWeight'] = {
-                    'light': 300,
-                    'normal': 400,
-                    'medium': 500,
-                    'semibold': 600,
-                    'bold': 700
-                }.get(weight, 400)
-            
-            # Font size
-            size_match = self.font_size_regex.match(cls)
-            if size_match:
-                sizes = {
-                    'xs': 12, 'sm': 14, 'base': 16, 'lg': 18,
-                    'xl': 20, '2xl': 24, '3xl': 30, '4xl': 36,
-                    '5xl': 48, '6xl': 60
-                }
-                font_styles['fontSize'] = sizes.get(size_match.group(1), 16)
-            
-            # Text alignment
-            if cls in ['text-left', 'text-center', 'text-right', 'text-justify']:
-                font_styles['textAlign'] = cls.split('-')[-1].upper()
-
-        html_node.figma_styles.update(font_styles)
-
-    def _process_dimension_classes(self, html_node: HTMLNode):
-        # Handle width/height classes
-        dimensions = {'w': 'width', 'h': 'height'}
-        for cls in html_node.classes:
-            match = self.dimension_regex.match(cls)
-            if match:
-                prop = dimensions[match.group(1)]
-                value = int(match.group(2)) * 4  # Convert tailwind units to pixels (1 = 4px)
-                html_node.figma_styles[prop] = value
+    def _mutable_styles(self, html_node: HTMLNode) -> Dict[str, any]:
+        # Copy the shared class styles the first time a node needs its own values
+        if not isinstance(html_node.figma_styles, dict):
+            html_node.figma_styles = dict(html_node.figma_styles)
+        return html_node.figma_styles
 
     def _apply_font_styles(self, html_node: HTMLNode, styles: dict):
         # Map CSS font properties to Figma properties
-        font_mapping = {
-            'font-size': ('fontSize', lambda v: int(float(v.replace('px', '')))),
-            'font-weight': ('fontWeight', lambda v: int(v)),
-            'text-align': ('textAlign', lambda v: v.upper()),
-            'line-height': ('lineHeight', lambda v: {'unit': 'PIXELS', 'value': int(float(v.replace('px', '')))})
-        }
-
-        for css_prop, (figma_prop, converter) in font_mapping.items():
+        for css_prop, (figma_prop, converter) in FONT_STYLE_CONVERTERS.items():
             if css_prop in styles:
                 try:
-                    html_node.figma_styles[figma_prop] = converter(styles[css_prop])
+                    self._mutable_styles(html_node)[figma_prop] = converter(styles[css_prop])
                 except Exception as e:
                     print(f"Error converting {css_prop}: {e}")
 
     def _apply_color_styles(self, html_node: HTMLNode, styles: dict):
         # Handle text and background colors
+        # Build new lists rather than append: class fills are shared (and may be frozen tuples),
+        # and so are the paints, which are cached per color string
         if 'color' in styles:
-            html_node.figma_styles.setdefault('fills', []).append({
-                'type': 'SOLID',
-                'color': self._normalize_color(styles['color'])
-            })
+            figma_styles = self._mutable_styles(html_node)
+            figma_styles['fills'] = [*figma_styles.get('fills', ()), _solid_paint(styles['color'])]
         
         if 'background-color' in styles:
-            html_node.figma_styles.setdefault('background', []).append({
-                'type': 'SOLID',
-                'color': self._normalize_color(styles['background-color'])
-            })
+            figma_styles = self._mutable_styles(html_node)
+            figma_styles['background'] = [*figma_styles.get('background', ()), _solid_paint(styles['background-color'])]
 
     def _parse_inline_styles(self, style_str: str) -> Dict[str, str]:
         """Parse inline CSS styles into a dictionary"""
-        sheet = cssutils.parseStyle(style_str)
-        return {prop.name: prop.value for prop in sheet}
-
-    def _process_text_color_classes(self, html_node: HTMLNode):
-        color_mapping = {
-            'text-textPrimary': {'r': 0.1, 'g': 0.1, 'b': 0.1},
-            'text-textSecondary': {'r': 0.4, 'g': 0.4, 'b': 0.4},
-            'text-primary': {'r': 0, 'g': 0.47, 'b': 1},  # Example primary color
-            'text-warning': {'r': 1, 'g': 0.8, 'b': 0}    # Example warning color
-        }
-        
-        for cls in html_node.classes:
-            if cls in color_mapping:
-                html_node.figma_styles.setdefault('fills', []).append({
-                    'type': 'SOLID',
-                    'color': color_mapping[cls]
-                })
+        styles = {}
+        for declaration in _DECLARATION_RE.findall(style_str):
+            name, sep, value = declaration.partition(':')
+            value = value.strip()
+            if sep and value:
+                styles[name.strip().lower()] = value
+        return styles
 
     def _process_image_node(self, html_node: HTMLNode, node: Tag):
+        figma_styles = self._mutable_styles(html_node)
+
         # Handle image source
         if 'src' in node.attrs:
             html_node.attributes['src'] = node['src']
-            html_node.figma_styles['imageHash'] = self._get_image_hash(node['src'])
-        
-        # Handle image dimensions from classes
-        dimensions = {
-            'w-full': '100%',
-            'h-40': 160,  # 40 * 4 = 160px
-            'w-24': 96,   # 24 * 4 = 96px
-            'h-24': 96
-        }
-    
-        for cls in html_node.classes:
-            if cls in dimensions:
-                prop = 'width' if cls.startswith('w-') else 'height'
-                html_node.figma_styles[prop] = dimensions[cls]
+            figma_styles['imageHash'] = self._get_image_hash(node['src'])
         
         # Default constraints
-        html_node.figma_styles.update({
+        figma_styles.update({
             'constraints': {'horizontal': 'SCALE', 'vertical': 'SCALE'},
             'layoutMode': 'NONE'
         })
 
+        # Handle image dimensions from classes
+        self._process_image_dimensions(html_node)
+
     def _get_image_hash(self, url: str) -> str:
         # Implement actual image fetching and hashing logic
         return f"image-{hash(url)}"  # Simplified example
 
     def _get_attributes(self, node: Tag) -> Dict[str, str]:
-        return {attr: node[attr] for attr in node.attrs if attr != 'class'}
+        # C-level copy and pop; no per-attribute Python loop
+        attributes = dict(node.attrs)
+        attributes.pop('class', None)
+        return attributes
+
+@lru_cache(maxsize=1024)
+def normalize_color(color: str) -> Tuple[float, float, float, float]:
+    """Convert a CSS color value to an (r, g, b, a) tuple, cached since pages reuse a small palette"""
+    # Dispatch on the prefix; malformed digits surface as KeyError/ValueError from the converters
+    color = color.strip()
+    try:
+        if color.startswith('#'):  # Hex color
+            if len(color) in (4, 5, 7, 9):
+                return _hex_to_rgba(color[1:])
+        elif color.startswith(('rgb(', 'rgba(')) and color.endswith(')'):  # RGB(A)
+            return _rgb_str_to_rgba(color[color.index('(') + 1:-1])
+    except (KeyError, ValueError):
+        pass
+    return (0, 0, 0, 1)
+
+@lru_cache(maxsize=1024)
+def _solid_paint(color: str) -> MappingProxyType:
+    """Read-only SOLID paint for a CSS color, built once and shared by every node using it"""
+    r, g, b, a = normalize_color(color)
+    return MappingProxyType({'type': 'SOLID', 'color': MappingProxyType({'r': r, 'g': g, 'b': b, 'a': a})})
+
+def _hex_to_rgba(hex_color: str) -> Tuple[float, float, float, float]:
+    # Hex conversion via lookup tables; short forms index the nibble table directly
+    if len(hex_color) <= 4:
+        hex_color = hex_color.lower()
+        return (
+            _HEX_NIBBLE[hex_color[0]],
+            _HEX_NIBBLE[hex_color[1]],
+            _HEX_NIBBLE[hex_color[2]],
+            _HEX_NIBBLE[hex_color[3]] if len(hex_color) == 4 else 1
+        )
 
-    def _parse_inline_styles(self, style_str: str) -> Dict[str, str]:
-        """Parse inline CSS styles into a dictionary"""
-        sheet = cssutils.parseStyle(style_str)
-        return {prop.name: prop.value for prop in sheet}
-
-    def _normalize_color(self, color: str) -> Dict[str, float]:
-        """Convert CSS color values to RGB(A) format"""
-        match = self.color_regex.match(color)
-        if not match:
-            return {'r': 0, 'g': 0, 'b': 0, 'a': 1}
-
-        if match.group(1):  # Hex color
-            hex_color = match.group(1)
-            return self._hex_to_rgb(hex_color)
-        else:  # RGB(A)
-            return self._rgb_str_to_dict(color)
-
-    def _hex_to_rgb(self, hex_color: str) -> Dict[str, float]:
-        # Hex conversion logic
-        length = len(hex_color)
-        if length == 3:
-            hex_color = ''.join([c * 2 for c in hex_color])
-        elif length == 4:
-            hex_color = ''.join([c * 2 for c in hex_color[:3]]) + hex_color[3] * 2
-
-        return {
-            'r': int(hex_color[0:2], 16) / 255,
-            'g': int(hex_color[2:4], 16) / 255,
-            'b': int(hex_color[4:6], 16) / 255,
-            'a': int(hex_color[6:8], 16) / 255 if len(hex_color) > 6 else 1
-        }
-
-    def _rgb_str_to_dict(self, rgb_str: str) -> Dict[str, float]:
-        # RGB/RGBA conversion logic
-        parts = [float(p) for p in re.findall(r'[\d.]+', rgb_str)]
-        if len(parts) == 3:
-            return {'r': parts[0]/255, 'g': parts[1]/255, 'b': parts[2]/255, 'a': 1}
-        if len(parts) == 4:
-            return {'r': parts[0]/255, 'g': parts[1]/255, 'b': parts[2]/255, 'a': parts[3]}
-        return {'r': 0, 'g': 0, 'b': 0, 'a': 1}
+    # Long forms decode to raw bytes in one C call; stray whitespace leaves too few bytes
+    # and the unpack raises ValueError like any other malformed value
+    if len(hex_color) == 6:
+        r, g, b = bytes.fromhex(hex_color)
+        return (_BYTE_UNIT[r], _BYTE_UNIT[g], _BYTE_UNIT[b], 1)
+    r, g, b, a = bytes.fromhex(hex_color)
+    return (_BYTE_UNIT[r], _BYTE_UNIT[g], _BYTE_UNIT[b], _BYTE_UNIT[a])
+
+def _rgb_str_to_rgba(components: str) -> Tuple[float, float, float, float]:
+    # RGB/RGBA conversion logic, given the text between the parentheses.
+    # float() also takes nan/inf and 1_000, so channels must be finite and in range
+    parts = [float(p) for p in components.split(',')]
+    if len(parts) not in (3, 4) or not all(0 <= p <= 255 for p in parts[:3]):
+        return (0, 0, 0, 1)
+    if len(parts) == 3:
+        return (parts[0]/255, parts[1]/255, parts[2]/255, 1)
+    if not 0 <= parts[3] <= 1:
+        return (0, 0, 0, 1)
+    return (parts[0]/255, parts[1]/255, parts[2]/255, parts[3])
+
+def _thaw(value):
+    # Plain dict/list copies of shared read-only style values for stdlib-JSON consumers
+    if isinstance(value, (dict, MappingProxyType)):
+        return {key: _thaw(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_thaw(item) for item in value]
+    return value
+
+def _node_fields(node: HTMLNode) -> dict:
+    return {
+        "tag": node.tag,
+        "classes": node.classes,
+        "text": node.text,
+        "attributes": node.attributes,
+        "figma_styles": _thaw(node.figma_styles),
+        "children": []
+    }
+
+def node_to_dict(node: HTMLNode) -> dict:
+    """Convert a parsed tree into nested dictionaries for JSON output"""
+    root = _node_fields(node)
+    stack = [(node, root)]
+    while stack:
+        html_node, data = stack.pop()
+        for child in html_node.children:
+            child_data = _node_fields(child)
+            data["children"].append(child_data)
+            stack.append((child, child_data))
+    return root
+
+def iter_json(node: HTMLNode):
+    """Yield the tree as JSON byte chunks without building intermediate dicts"""
+    stack = [node]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, bytes):
+            yield item
+            continue
+
+        # Serialise the node's own fields in one call and leave the object open for its children
+        yield orjson.dumps({
+            "tag": item.tag,
+            "classes": item.classes,
+            "text": item.text,
+            "attributes": item.attributes,
+            "figma_styles": item.figma_styles
+        }, default=dict)[:-1] + b',"children":['
+        # Pushed in reverse with separators so children come out in document order
+        stack.append(b']}')
+        for index in range(len(item.children) - 1, -1, -1):
+            stack.append(item.children[index])
+            if index:
+                stack.append(b',')
 
 def export_to_json(parsed_node: HTMLNode, filename: str = "design_specs.json"):
-    def node_to_dict(node: HTMLNode) -> dict:
-        return {
-            "tag": node.tag,
-            "classes": node.classes,
-            "text": node.text,
-            "attributes": node.attributes,
-            "figma_styles": node.figma_styles,
-            "children": [node_to_dict(child) for child in node.children]
-        }
-    
     design_data = node_to_dict(parsed_node)
-    with open(f"output_files/{filename}", "w") as f:
-        json.dump(design_data, f, indent=2)
+    with open(f"output_files/{filename}", "wb") as f:
+        f.write(orjson.dumps(design_data, option=orjson.OPT_INDENT_2))
 
 
 # @app.route('/getDesignSpecs', methods=['POST'])
@@ -366,16 +475,6 @@ def export_to_json(parsed_node: HTMLNode, filename: str = "design_specs.json"):
 #         parsed = parser.parse(html)
         
 #         # Convert to dictionary for JSON response
-#         def node_to_dict(node: HTMLNode) -> dict:
-#             return {
-#                 "tag": node.tag,
-#                 "classes": node.classes,
-#                 "text": node.text,
-#                 "attributes": node.attributes,
-#                 "figma_styles": node.figma_styles,
-#                 "children": [node_to_dict(child) for child in node.children]
-#             }
-        
 #         design_data = node_to_dict(parsed)
         
 #         # For debug purposes - write to file
@@ -429,3 +528,19 @@ def export_to_json(parsed_node: HTMLNode, filename: str = "design_specs.json"):
 #     print_node(parsed)
 #     export_to_json(parsed)
 
+
+# Timing check: python -m utils.html_parser
+if __name__ == "__main__":
+    import time
+
+    # Framework detection runs on every request before parsing, so it must stay linear
+    # on hostile markup: ten times the input should cost roughly ten times the time
+    parser = HTMLParser()
+    for unit in ('<a class=x ', '<a class="x ', '<link href=x ', '<script src=', '<a class=x class=x '):
+        timings = []
+        for n in (2000, 20000):
+            start = time.perf_counter()
+            parser._detect_framework(unit * n)
+            timings.append(time.perf_counter() - start)
+        print(f"{unit!r}: {timings[0]:.4f}s -> {timings[1]:.4f}s")
+        assert timings[1] < max(timings[0], 1e-3) * 40, f"framework detection is superlinear on {unit!r}"
@@ -1,4 +1,8 @@
-from typing import List, Dict
+from typing import List, Dict, Tuple
+from types import MappingProxyType
+from functools import lru_cache
+import sys
+from .frozen_styles import freeze
 
 # Style Resolution Matrix for Tailwind to Figma
 TAILWIND_TO_FIGMA = {
@@ -45,15 +49,32 @@ TAILWIND_TO_FIGMA = {
     "left-3": {"x": 12},
 }
 
+# Width/height scale, pre-enumerated so class lookups never need a regex (1 unit = 4px).
+# Covers Tailwind's default spacing scale: 0-96 plus px and the half steps. Larger
+# numbers (w-120, h-200) are not in the table; html_parser sizes them at 4px per unit
+_TAILWIND_SPACING = {**{str(n): n * 4 for n in range(97)}, "px": 1, "0.5": 2, "1.5": 6, "2.5": 10, "3.5": 14}
+TAILWIND_DIMENSIONS = {
+    **{f"w-{step}": {"width": size} for step, size in _TAILWIND_SPACING.items()},
+    **{f"h-{step}": {"height": size} for step, size in _TAILWIND_SPACING.items()},
+}
+TAILWIND_TO_FIGMA.update({cls: {**TAILWIND_TO_FIGMA.get(cls, {}), **styles} for cls, styles in TAILWIND_DIMENSIONS.items()})
+
+# Keys interned so lookups with interned class names short-circuit on identity; nested
+# values frozen once here, since every resolved result shares them with the matrix
+TAILWIND_TO_FIGMA = {sys.intern(cls): {prop: freeze(value) for prop, value in styles.items()} for cls, styles in TAILWIND_TO_FIGMA.items()}
+
+# Keyed by the ordered tuple, not a set: when classes overlap the later one wins
+@lru_cache(maxsize=4096)
+def _resolve_tailwind_classes(classes: Tuple[str, ...]) -> MappingProxyType:
+    hits = [styles for styles in map(TAILWIND_TO_FIGMA.get, classes) if styles]
+    return MappingProxyType({prop: value for styles in hits for prop, value in styles.items()})
+
 # Function to resolve Tailwind classes to Figma styles
 def resolve_tailwind_styles(classes: List[str]) -> Dict[str, any]:
-    styles = {}
-    for cls in classes:
-        if cls in TAILWIND_TO_FIGMA:
-            styles.update(TAILWIND_TO_FIGMA[cls])
-    return styles
+    # Shallow copy; list-valued props (fills, effects) come back as fresh lists of frozen items
+    return {prop: list(value) if type(value) is tuple else value for prop, value in _resolve_tailwind_classes(tuple(classes)).items()}
 
-# Example usage
+# Example usage (python -m utils.tailwind_to_figma_resolver)
 if __name__ == "__main__":
     # Example Tailwind classes from a parsed node
     example_classes = ["flex", "items-center", "justify-center", "p-4", "bg-surface", "rounded-xl"]